@@ -68,8 +68,233 @@ DEFAULT_THINKING_MODE_THINKDEEP = os.getenv("DEFAULT_THINKING_MODE_THINKDEEP", "
 DEFAULT_CONSENSUS_TIMEOUT = 120.0  # 2 minutes per model
 DEFAULT_CONSENSUS_MAX_INSTANCES_PER_COMBINATION = 2
 
-# NOTE: Consensus tool now uses sequential processing for MCP compatibility
-# Concurrent processing was removed to avoid async pattern violations
+# NOTE: Consensus tool uses sequential processing (one model per step) by default.
+# Its opt-in parallel mode consults every model concurrently in step 1, bounding
+# each model by DEFAULT_CONSENSUS_TIMEOUT and returning whichever responses arrived.
+
+# Provider Executor Configuration
+# PROVIDER_MAX_WORKERS: Size of the thread pool that runs blocking provider calls
+# Built-in providers implement agenerate_content with async SDK clients and never
+# use this pool. Providers without a native async path fall back to it, which keeps
+# the MCP event loop responsive so concurrent tool calls really do run in parallel.
+# Each in-flight blocking model request occupies one worker until it completes.
+try:
+    PROVIDER_MAX_WORKERS = max(1, int(os.getenv("PROVIDER_MAX_WORKERS", "8")))
+except ValueError:
+    # Fall back to default if PROVIDER_MAX_WORKERS is not a valid integer
+    PROVIDER_MAX_WORKERS = 8
+
+# File Reading Configuration
+# FILE_READ_CONCURRENCY: Files stat'ed and read in parallel when embedding files
+# Reading thousands of files one at a time dominates tool latency on network mounts;
+# read_files plans the token budget from file sizes, then reads each batch of files
+# concurrently. Output order stays the same. Set to 1 to read files sequentially.
+try:
+    FILE_READ_CONCURRENCY = max(1, int(os.getenv("FILE_READ_CONCURRENCY", "8")))
+except ValueError:
+    FILE_READ_CONCURRENCY = 8
+
+# FILE_CONTENT_CACHE_MAX_MB: Memory for prepared file content shared across tools and turns
+# Files are keyed by path, size, modification time and inode, so edited files are
+# always re-read; unchanged files embedded again (continuations, expert analysis)
+# come from memory. Least recently used files are evicted first. 0 disables the cache.
+try:
+    FILE_CONTENT_CACHE_MAX_MB = max(0.0, float(os.getenv("FILE_CONTENT_CACHE_MAX_MB", "64")))
+except ValueError:
+    FILE_CONTENT_CACHE_MAX_MB = 64.0
+
+# Provider Retry Policy
+# Failed provider requests are retried with jittered exponential backoff, honouring
+# Retry-After / x-ratelimit-reset headers when the provider sends them.
+# RETRY_MAX_ATTEMPTS: Total attempts per request, including the first
+# RETRY_MAX_DELAY: Upper bound in seconds for a single backoff delay
+# RETRY_MAX_RETRY_AFTER: Longest server-requested wait (seconds) to honour before giving up
+# RETRY_BUDGET_PER_MINUTE: Maximum retries per provider in any 60 second window, so a
+# provider that is already rate limiting isn't hit by every request retrying at once
+try:
+    RETRY_MAX_ATTEMPTS = max(1, int(os.getenv("RETRY_MAX_ATTEMPTS", "4")))
+except ValueError:
+    RETRY_MAX_ATTEMPTS = 4
+
+try:
+    RETRY_MAX_DELAY = max(1.0, float(os.getenv("RETRY_MAX_DELAY", "20")))
+except ValueError:
+    RETRY_MAX_DELAY = 20.0
+
+try:
+    RETRY_MAX_RETRY_AFTER = max(0.0, float(os.getenv("RETRY_MAX_RETRY_AFTER", "60")))
+except ValueError:
+    RETRY_MAX_RETRY_AFTER = 60.0
+
+try:
+    RETRY_BUDGET_PER_MINUTE = max(0, int(os.getenv("RETRY_BUDGET_PER_MINUTE", "30")))
+except ValueError:
+    RETRY_BUDGET_PER_MINUTE = 30
+
+# Client-side Rate Limiting
+# Requests-per-minute and tokens-per-minute budgets per provider and model are read
+# from conf/rate_limits.json (or the file named by RATE_LIMITS_CONFIG_PATH). Requests
+# over budget are held back locally instead of being sent only to earn a 429.
+# RATE_LIMIT_MODE: "queue" waits for capacity, "fail" rejects the request immediately
+# RATE_LIMIT_MAX_WAIT: Longest time (seconds) a queued request waits before failing
+RATE_LIMIT_MODE = os.getenv("RATE_LIMIT_MODE", "queue").lower()
+if RATE_LIMIT_MODE not in ("queue", "fail"):
+    RATE_LIMIT_MODE = "queue"
+
+try:
+    RATE_LIMIT_MAX_WAIT = max(0.0, float(os.getenv("RATE_LIMIT_MAX_WAIT", "30")))
+except ValueError:
+    RATE_LIMIT_MAX_WAIT = 30.0
+
+# Provider Circuit Breakers
+# A provider that keeps failing is taken out of rotation for a while instead of
+# receiving (and retrying) every request. While its circuit is open, requests for
+# models that OpenRouter or a Custom endpoint also serve are routed there.
+# CIRCUIT_BREAKER_FAILURE_THRESHOLD: Consecutive failures that open the circuit (0 disables)
+# CIRCUIT_BREAKER_RECOVERY_TIMEOUT: Seconds before a trial request is sent to an open provider
+try:
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = max(0, int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5")))
+except ValueError:
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+
+try:
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT = max(1.0, float(os.getenv("CIRCUIT_BREAKER_RECOVERY_TIMEOUT", "60")))
+except ValueError:
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT = 60.0
+
+# Hedged Requests
+# Latency-critical tools (chat) can hedge slow requests: if the first attempt hasn't
+# returned within HEDGE_PERCENTILE of the model's recent latency, an identical request
+# is sent and whichever finishes first wins. Hedges cost extra tokens, so this is opt-in.
+# HEDGE_ENABLED: Turn hedging on for tools that support it
+# HEDGE_PERCENTILE: Latency percentile (of recent requests to the model) to wait before hedging
+# HEDGE_MIN_SAMPLES: Requests a model must have completed before its requests are hedged
+# HEDGE_SIBLING_MODELS: Send hedges to another model, e.g. "gemini-2.5-pro=gemini-2.5-flash,o3=o4-mini"
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+
+try:
+    HEDGE_PERCENTILE = min(99.9, max(50.0, float(os.getenv("HEDGE_PERCENTILE", "95"))))
+except ValueError:
+    HEDGE_PERCENTILE = 95.0
+
+try:
+    HEDGE_MIN_SAMPLES = max(1, int(os.getenv("HEDGE_MIN_SAMPLES", "20")))
+except ValueError:
+    HEDGE_MIN_SAMPLES = 20
+
+HEDGE_SIBLING_MODELS = os.getenv("HEDGE_SIBLING_MODELS", "")
+
+# Response Streaming
+# When an MCP client asks for progress on a tool call, provider responses are streamed
+# and progress notifications are sent as text arrives, so long analyses don't sit
+# silent for minutes. Set to false to always wait for complete responses.
+PROVIDER_STREAMING = os.getenv("PROVIDER_STREAMING", "true").lower() == "true"
+
+# Response Cache
+# Identical requests (same resolved model, prompts, temperature, thinking mode and
+# images) can be answered from a cache instead of calling the provider again, which
+# helps re-runs over unchanged files, simulator replays and CI jobs. Off by default.
+# RESPONSE_CACHE_ENABLED: Serve identical requests from the cache
+# RESPONSE_CACHE_TTL: Seconds a cached response stays valid
+# RESPONSE_CACHE_MAX_ENTRIES: Responses kept in the in-memory LRU tier
+# RESPONSE_CACHE_DIR: Directory of the on-disk tier (default: ~/.cache/zen-mcp-server/responses)
+# RESPONSE_CACHE_MAX_DISK_MB: Size limit of the on-disk tier; 0 keeps the cache in memory only
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+
+try:
+    RESPONSE_CACHE_TTL = max(1, int(os.getenv("RESPONSE_CACHE_TTL", "86400")))
+except ValueError:
+    RESPONSE_CACHE_TTL = 86400
+
+try:
+    RESPONSE_CACHE_MAX_ENTRIES = max(1, int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256")))
+except ValueError:
+    RESPONSE_CACHE_MAX_ENTRIES = 256
+
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", "")
+
+try:
+    RESPONSE_CACHE_MAX_DISK_MB = max(0.0, float(os.getenv("RESPONSE_CACHE_MAX_DISK_MB", "200")))
+except ValueError:
+    RESPONSE_CACHE_MAX_DISK_MB = 200.0
+
+# Provider Prompt Caching
+# Workflow tools send the stable part of an expert-analysis prompt (system prompt and
+# embedded files) ahead of the parts that change between calls, so providers with
+# prefix caching (OpenAI, Gemini 2.5) can reuse it. In conversation threads, Gemini
+# additionally gets an explicit context cache whose handle is kept with the thread.
+# Explicit caches are billed for storage per token and hour on top of the discounted
+# cached-token reads, so they are opt-in.
+# GEMINI_CONTEXT_CACHING: Create explicit Gemini context caches for continued threads
+# GEMINI_CONTEXT_CACHE_TTL: Seconds an explicit context cache lives
+# GEMINI_CONTEXT_CACHE_MIN_TOKENS: Smallest stable prefix (estimated tokens) worth caching explicitly
+GEMINI_CONTEXT_CACHING = os.getenv("GEMINI_CONTEXT_CACHING", "false").lower() == "true"
+
+try:
+    GEMINI_CONTEXT_CACHE_TTL = max(60, int(os.getenv("GEMINI_CONTEXT_CACHE_TTL", "1800")))
+except ValueError:
+    GEMINI_CONTEXT_CACHE_TTL = 1800
+
+try:
+    GEMINI_CONTEXT_CACHE_MIN_TOKENS = max(1024, int(os.getenv("GEMINI_CONTEXT_CACHE_MIN_TOKENS", "4096")))
+except ValueError:
+    GEMINI_CONTEXT_CACHE_MIN_TOKENS = 4096
+
+# Token Counting
+# File budgets, conversation history and prompt size checks count tokens with the
+# target model's tokenizer: tiktoken encodings for OpenAI models and the google-genai
+# local tokenizer for Gemini, when those libraries are installed and their vocabularies
+# are available. Other models, or a missing tokenizer, use a ~4 characters/token estimate.
+# TOKENIZER_BACKEND: "auto" (model tokenizers where available) or "estimate" (always estimate)
+TOKENIZER_BACKEND = os.getenv("TOKENIZER_BACKEND", "auto").lower()
+if TOKENIZER_BACKEND not in ("auto", "estimate"):
+    TOKENIZER_BACKEND = "auto"
+# TOKENIZER_LOAD_TIMEOUT: Seconds code off the event loop waits for a tokenizer to load
+# (loading may download its vocabulary); the estimate is used meanwhile. Code on the
+# event loop never waits.
+try:
+    TOKENIZER_LOAD_TIMEOUT = max(0.0, float(os.getenv("TOKENIZER_LOAD_TIMEOUT", "10")))
+except ValueError:
+    TOKENIZER_LOAD_TIMEOUT = 10.0
+
+# Models without a tokenizer have their estimates calibrated from the prompt token
+# counts providers report: a chars-per-token ratio is learned per model family and
+# file type, and kept between runs.
+# TOKEN_CALIBRATION_ENABLED: Learn estimation ratios from reported usage
+# TOKEN_CALIBRATION_FILE: Where learned ratios are kept (default: ~/.cache/zen-mcp-server/token_calibration.json)
+TOKEN_CALIBRATION_ENABLED = os.getenv("TOKEN_CALIBRATION_ENABLED", "true").lower() == "true"
+TOKEN_CALIBRATION_FILE = os.getenv("TOKEN_CALIBRATION_FILE", "")
+
+# HTTP Connection Pool Configuration
+# OpenAI-compatible providers (OpenAI, X.AI, OpenRouter, Custom, DIAL) share one
+# pooled HTTP transport so connections to the same host are kept alive and reused
+# instead of paying a new TCP + TLS handshake for every request.
+# HTTP_MAX_CONNECTIONS: Maximum concurrent connections across all provider hosts
+# HTTP_MAX_KEEPALIVE_CONNECTIONS: Idle connections kept open for reuse
+# HTTP_KEEPALIVE_EXPIRY: Seconds an idle connection is kept before being closed
+try:
+    HTTP_MAX_CONNECTIONS = max(1, int(os.getenv("HTTP_MAX_CONNECTIONS", "100")))
+except ValueError:
+    HTTP_MAX_CONNECTIONS = 100
+
+try:
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = max(0, int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")))
+except ValueError:
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+
+try:
+    HTTP_KEEPALIVE_EXPIRY = max(0.0, float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")))
+except ValueError:
+    HTTP_KEEPALIVE_EXPIRY = 30.0
+
+# HTTP2_ENABLED: Multiplex requests to the same host over one HTTP/2 connection
+# Requires the optional 'h2' package (pip install "httpx[http2]"); falls back to
+# HTTP/1.1 with a warning when it is not installed
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+# HTTP_WARMUP_ON_STARTUP: Open connections to configured provider hosts when the
+# server starts, so the first tool call doesn't pay the TLS handshake
+HTTP_WARMUP_ON_STARTUP = os.getenv("HTTP_WARMUP_ON_STARTUP", "false").lower() == "true"
 
 # MCP Protocol Transport Limits
 #
@@ -148,3 +373,52 @@ LOCALE = os.getenv("LOCALE", "")
 # Threading configuration
 # Simple in-memory conversation threading for stateless MCP environment
 # Conversations persist only during the Claude session
+#
+# CONVERSATION_STORAGE_FORMAT: How the in-memory store keeps threads
+# - "object": immutable ThreadContext snapshots, read and appended without JSON
+#   encoding (default)
+# - "json": serialized the way a Redis-style store would hold them, with turns
+#   appended as list items
+CONVERSATION_STORAGE_FORMAT = os.getenv("CONVERSATION_STORAGE_FORMAT", "object").lower()
+if CONVERSATION_STORAGE_FORMAT not in ("object", "json"):
+    CONVERSATION_STORAGE_FORMAT = "object"
+
+# CONVERSATION_STORAGE_BACKEND: Where conversation threads live
+# - "memory": process-local, lost when the server exits (default)
+# - "sqlite": a SQLite database that survives restarts and is shared by every
+#   server process on this host
+# CONVERSATION_STORAGE_PATH: SQLite database file (default: ~/.cache/zen-mcp-server/conversations.db)
+CONVERSATION_STORAGE_BACKEND = os.getenv("CONVERSATION_STORAGE_BACKEND", "memory").lower()
+if CONVERSATION_STORAGE_BACKEND not in ("memory", "sqlite"):
+    CONVERSATION_STORAGE_BACKEND = "memory"
+CONVERSATION_STORAGE_PATH = os.getenv("CONVERSATION_STORAGE_PATH", "")
+
+# CONVERSATION_STORAGE_MAX_MB: Memory ceiling of the in-memory store; writes beyond it
+# evict the least recently used threads (0 disables the limit)
+try:
+    CONVERSATION_STORAGE_MAX_MB = max(0.0, float(os.getenv("CONVERSATION_STORAGE_MAX_MB", "512")))
+except ValueError:
+    CONVERSATION_STORAGE_MAX_MB = 512.0
+
+# CONVERSATION_STORAGE_SHARDS: Independently locked partitions of the in-memory store,
+# so tool calls on different threads don't wait for one lock. The memory ceiling is
+# split evenly between them, and least-recently-used eviction happens per shard.
+try:
+    CONVERSATION_STORAGE_SHARDS = max(1, int(os.getenv("CONVERSATION_STORAGE_SHARDS", "16")))
+except ValueError:
+    CONVERSATION_STORAGE_SHARDS = 16
+
+# CONVERSATION_COMPRESSION: Codec for large serialized threads and turns kept by the
+# storage backends. Only applies to JSON payloads (CONVERSATION_STORAGE_FORMAT=json or
+# the sqlite backend); with the default object format nothing is compressed
+# - "zlib": always available (default)
+# - "zstd": faster, needs the optional "zstandard" package (falls back to zlib)
+# - "none": store values uncompressed
+# CONVERSATION_COMPRESSION_MIN_KB: Smallest value worth compressing
+CONVERSATION_COMPRESSION = os.getenv("CONVERSATION_COMPRESSION", "zlib").lower()
+if CONVERSATION_COMPRESSION not in ("zlib", "zstd", "none"):
+    CONVERSATION_COMPRESSION = "zlib"
+try:
+    CONVERSATION_COMPRESSION_MIN_KB = max(0.0, float(os.getenv("CONVERSATION_COMPRESSION_MIN_KB", "4")))
+except ValueError:
+    CONVERSATION_COMPRESSION_MIN_KB = 4.0